@@ -0,0 +1 @@
+# Lets pytest import the bot's top-level modules from the tests directory
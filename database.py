@@ -0,0 +1,202 @@
+import asyncio
+import datetime
+import heapq
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Seconds a leaderboard result stays valid if no balance changes
+TOP_CACHE_TTL = 10
+
+
+def _display_name(user_id: int, username: Optional[str]) -> str:
+    """Name shown on the leaderboard."""
+    return username if username else f"User{str(user_id)[:4]}"
+
+
+class UserDatabase:
+    """User balances kept in memory and written back to a JSON file in batches."""
+
+    def __init__(self, filename: str, flush_interval: float = 5.0):
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self._users: dict[int, dict] = {}
+        self._username_index: dict[str, int] = {}
+        # Bumped on every write; flush skips when nothing moved since the last one
+        self._rev = 0
+        self._last_flushed_rev = 0
+        self._top_cache: dict[int, tuple[float, list]] = {}
+        # A cancelled flush_loop leaves its worker thread running, so flushes must not overlap
+        self._flush_lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Read the JSON file once at startup."""
+        if not os.path.exists(self.filename):
+            return
+        # Refuse to start on an unreadable file: the next flush would overwrite every account
+        try:
+            with open(self.filename, 'rb') as f:
+                data = orjson.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load {self.filename}: {e}")
+            raise
+        # JSON object keys are always strings
+        self._users = {int(user_id): user for user_id, user in data.items()}
+        for user_id, user in self._users.items():
+            user.setdefault('balance', 0)
+            user.setdefault('display_name', _display_name(user_id, user.get('username')))
+            # Older files stored claim times as ISO strings
+            for field in ('last_daily', 'last_weekly'):
+                if isinstance(user.get(field), str):
+                    user[field] = int(datetime.datetime.fromisoformat(user[field]).timestamp())
+            self._index_username(user_id, user.get('username'))
+
+    def _index_username(self, user_id: int, username: Optional[str]) -> None:
+        if username:
+            self._username_index[username.lower()] = user_id
+
+    def _get_user(self, user_id: int) -> dict:
+        """Return the user's record, creating an empty one if needed."""
+        user = self._users.get(user_id)
+        if user is None:
+            user = {
+                'username': None,
+                'display_name': _display_name(user_id, None),
+                'balance': 0,
+                'last_daily': None,
+                'last_weekly': None,
+            }
+            self._users[user_id] = user
+        return user
+
+    def _touch(self) -> None:
+        self._rev += 1
+
+    def _balance_changed(self) -> None:
+        self._top_cache.clear()
+        self._touch()
+
+    # Users
+
+    def user_exists(self, user_id: int) -> bool:
+        return user_id in self._users
+
+    def add_user(self, user_id: int, username: Optional[str], balance: int = 0) -> None:
+        user = self._get_user(user_id)
+        user['username'] = username
+        user['display_name'] = _display_name(user_id, username)
+        user['balance'] = balance
+        self._index_username(user_id, username)
+        self._balance_changed()
+
+    def get_user_id_by_username(self, username: str) -> Optional[int]:
+        return self._username_index.get(username.lower())
+
+    def get_all_users(self) -> list[int]:
+        return list(self._users)
+
+    def reset_all_data(self) -> None:
+        self._users.clear()
+        self._username_index.clear()
+        self._balance_changed()
+
+    # Balances
+
+    def get_balance(self, user_id: int) -> int:
+        user = self._users.get(user_id)
+        return user['balance'] if user else 0
+
+    def has_sufficient_balance(self, user_id: int, amount: int) -> bool:
+        return self.get_balance(user_id) >= amount
+
+    def add_balance(self, user_id: int, amount: int) -> None:
+        self._get_user(user_id)['balance'] += amount
+        self._balance_changed()
+
+    def deduct_balance(self, user_id: int, amount: int) -> None:
+        self._get_user(user_id)['balance'] -= amount
+        self._balance_changed()
+
+    def set_balance(self, user_id: int, amount: int) -> None:
+        self._get_user(user_id)['balance'] = amount
+        self._balance_changed()
+
+    def get_top_users(self, limit: int = 10) -> list[tuple[int, str, int]]:
+        """Return (user_id, display_name, balance) for the richest users."""
+        cached = self._top_cache.get(limit)
+        if cached and time.monotonic() - cached[0] < TOP_CACHE_TTL:
+            return cached[1]
+        ranked = heapq.nlargest(limit, self._users.items(), key=lambda item: item[1]['balance'])
+        top = [(user_id, user['display_name'], user['balance']) for user_id, user in ranked]
+        self._top_cache[limit] = (time.monotonic(), top)
+        return top
+
+    # Bonuses
+
+    def get_last_daily(self, user_id: int) -> Optional[int]:
+        return self._get_timestamp(user_id, 'last_daily')
+
+    def set_last_daily(self, user_id: int, timestamp: int) -> None:
+        self._set_timestamp(user_id, 'last_daily', timestamp)
+
+    def get_last_weekly(self, user_id: int) -> Optional[int]:
+        return self._get_timestamp(user_id, 'last_weekly')
+
+    def set_last_weekly(self, user_id: int, timestamp: int) -> None:
+        self._set_timestamp(user_id, 'last_weekly', timestamp)
+
+    def _get_timestamp(self, user_id: int, field: str) -> Optional[int]:
+        user = self._users.get(user_id)
+        return user.get(field) if user else None
+
+    def _set_timestamp(self, user_id: int, field: str, timestamp: int) -> None:
+        """Store a claim time as unix epoch seconds."""
+        self._get_user(user_id)[field] = timestamp
+        self._touch()
+
+    # Persistence
+
+    def flush(self) -> None:
+        """Write all users to disk if anything changed since the last flush.
+
+        Safe to run in a worker thread: orjson serializes while holding the
+        GIL, so the snapshot is consistent with the event loop's writes.
+        """
+        with self._flush_lock:
+            rev = self._rev
+            if rev == self._last_flushed_rev:
+                return
+            data = orjson.dumps(self._users, option=orjson.OPT_NON_STR_KEYS)
+            fd, tmp = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.filename)),
+                prefix='users.', suffix='.json.tmp'
+            )
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.filename)
+            except Exception:
+                os.unlink(tmp)
+                raise
+            # Writes made while serializing bumped _rev and are picked up next time
+            self._last_flushed_rev = rev
+
+    async def flush_loop(self) -> None:
+        """Periodically persist pending changes until cancelled."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                # fsync can take a while, keep it off the event loop
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Failed to flush {self.filename}: {e}")
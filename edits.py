@@ -0,0 +1,119 @@
+import asyncio
+import datetime
+import logging
+import time
+from typing import Optional
+
+from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import RetryAfter
+
+logger = logging.getLogger(__name__)
+
+# Telegram allows roughly one message edit per second per chat
+EDIT_INTERVAL = 1.0
+MAX_RETRY_AFTER = 30
+# Idle chats keep their state this long so repeated identical edits are still caught
+EDIT_STATE_TTL = 60
+
+# Per-chat edit pacing state. Queued payloads and the dedupe record are kept
+# per message, so an edit to one message never replaces an edit to another.
+_edit_state: dict[int, dict] = {}
+
+
+def _keyboard_hash(keyboard: list[list[InlineKeyboardButton]]) -> int:
+    """Hash the visible state of a keyboard so identical edits can be skipped."""
+    return hash(tuple((btn.text, btn.callback_data) for row in keyboard for btn in row))
+
+
+async def throttled_edit(bot: Bot, chat_id: int, message_id: int, text: str,
+                         reply_markup: Optional[InlineKeyboardMarkup] = None) -> None:
+    """Edit a message, pacing edits per chat and coalescing bursts per message."""
+    state = _edit_state.setdefault(chat_id, {
+        "last": 0.0,
+        "suppress_until": 0.0,
+        "pending": None,
+        "queued": {},
+        "sent": {},
+    })
+    # Replaces an older queued edit for the same message only
+    state["queued"][message_id] = (text, reply_markup)
+
+    # A drain task is already scheduled and will send the freshest payloads
+    if state["pending"] is not None:
+        return
+
+    if time.monotonic() >= _ready_at(state):
+        await _flush_next(bot, chat_id, state)
+    _schedule_drain(bot, chat_id, state)
+
+
+def _ready_at(state: dict) -> float:
+    return max(state["last"] + EDIT_INTERVAL, state["suppress_until"])
+
+
+def _schedule_drain(bot: Bot, chat_id: int, state: dict) -> None:
+    """Start a task that sends the remaining queued edits once the cooldown allows."""
+    if state["pending"] is None and state["queued"]:
+        delay = max(0.0, _ready_at(state) - time.monotonic())
+        state["pending"] = asyncio.create_task(_drain(bot, chat_id, state, delay))
+
+
+async def _drain(bot: Bot, chat_id: int, state: dict, delay: float) -> None:
+    """Wait out the cooldown, send the oldest queued edit and reschedule if more remain."""
+    await asyncio.sleep(delay)
+    state["pending"] = None
+    await _flush_next(bot, chat_id, state)
+    _schedule_drain(bot, chat_id, state)
+
+
+async def _flush_next(bot: Bot, chat_id: int, state: dict) -> None:
+    """Send the oldest queued edit for a chat."""
+    if not state["queued"]:
+        return
+    message_id = next(iter(state["queued"]))
+    text, reply_markup = state["queued"].pop(message_id)
+
+    # Telegram rejects edits that leave the message unchanged
+    markup_hash = _keyboard_hash(reply_markup.inline_keyboard) if reply_markup else None
+    rendered = (hash(text), markup_hash)
+    sent = state["sent"].get(message_id)
+    if sent == rendered:
+        return
+
+    state["last"] = time.monotonic()
+    try:
+        # Only the keyboard changed, so skip resending the text
+        if sent and sent[0] == rendered[0]:
+            await bot.edit_message_reply_markup(
+                chat_id=chat_id, message_id=message_id, reply_markup=reply_markup
+            )
+        else:
+            await bot.edit_message_text(
+                text, chat_id=chat_id, message_id=message_id, reply_markup=reply_markup
+            )
+        state["sent"][message_id] = rendered
+    except RetryAfter as e:
+        retry_after = e.retry_after
+        if isinstance(retry_after, datetime.timedelta):
+            retry_after = retry_after.total_seconds()
+        retry_after = min(float(retry_after), MAX_RETRY_AFTER)
+        logger.warning(f"Edit rate limited in chat {chat_id}, backing off {retry_after}s")
+        state["suppress_until"] = time.monotonic() + retry_after
+        # Put the edit back at the front unless a newer one for the message arrived
+        if message_id not in state["queued"]:
+            state["queued"] = {message_id: (text, reply_markup), **state["queued"]}
+    except Exception as e:
+        logger.error(f"Error editing message in chat {chat_id}: {e}")
+
+    # Drop the chat's state once it has been idle with nothing else queued
+    asyncio.get_running_loop().call_later(
+        EDIT_STATE_TTL, _evict_edit_state, chat_id, state, state["last"]
+    )
+
+
+def _evict_edit_state(chat_id: int, state: dict, last: float) -> None:
+    """Forget a chat's edit state if nothing was sent or queued since `last`."""
+    if (_edit_state.get(chat_id) is state and state["pending"] is None
+            and not state["queued"] and state["last"] == last
+            and time.monotonic() >= state["suppress_until"]):
+        del _edit_state[chat_id]
@@ -0,0 +1,74 @@
+import asyncio
+import random
+import time
+from typing import Optional
+
+GRID_SIZE = 5
+TILE_COUNT = GRID_SIZE * GRID_SIZE
+
+GEM = "💎"
+BOMB = "💣"
+
+# Module-level generator so bomb placement can be seeded in tests
+_rng = random.Random()
+
+# Share of the fair payout returned to the player
+HOUSE_EDGE = 0.97
+
+
+class MinesGame:
+    """A single Mines round with the board packed into two bitmasks.
+
+    Bit ``row * GRID_SIZE + col`` of ``bomb_mask`` is set for bomb tiles and
+    the same bit of ``revealed_mask`` is set once the tile has been opened.
+    """
+
+    def __init__(self, bet_amount: int, mines_count: int):
+        self.bet_amount = bet_amount
+        self.mines_count = mines_count
+        # Where the board message lives, set once it has been sent
+        self.chat_id: Optional[int] = None
+        self.message_id: Optional[int] = None
+
+        self.bomb_mask = 0
+        for idx in _rng.sample(range(TILE_COUNT), mines_count):
+            self.bomb_mask |= 1 << idx
+        self.revealed_mask = 0
+        self.last_touch = time.monotonic()
+
+        # Serializes clicks so a game cannot be paid out or revealed twice
+        self.lock = asyncio.Lock()
+        # 5x5 grid of the tile buttons currently shown, filled in by the bot
+        self.tile_buttons: list[list] = []
+
+    @property
+    def gems_revealed(self) -> int:
+        return (self.revealed_mask & ~self.bomb_mask).bit_count()
+
+    @property
+    def current_multiplier(self) -> float:
+        """Fair odds of surviving every reveal so far, less the house edge."""
+        gems = self.gems_revealed
+        if gems == 0:
+            return 1.0
+        multiplier = HOUSE_EDGE
+        safe_tiles = TILE_COUNT - self.mines_count
+        for k in range(gems):
+            multiplier *= (TILE_COUNT - k) / (safe_tiles - k)
+        return multiplier
+
+    def is_revealed(self, idx: int) -> bool:
+        return bool((self.revealed_mask >> idx) & 1)
+
+    def is_bomb(self, idx: int) -> bool:
+        return bool((self.bomb_mask >> idx) & 1)
+
+    def tile_value(self, idx: int) -> str:
+        return BOMB if self.is_bomb(idx) else GEM
+
+    def reveal_tile(self, row: int, col: int) -> bool:
+        """Open a tile. Returns False if it was a bomb."""
+        self.last_touch = time.monotonic()
+        bit = 1 << (row * GRID_SIZE + col)
+        self.revealed_mask |= bit
+        return not (self.bomb_mask & bit)
@@ -1,16 +1,23 @@
 
 import random
 
+_rng = random.Random()
+
+_REWARDS = ('₹100', '₹50', 'Emojis', 'Nothing')
+_OUTCOMES = ('Diamond', 'Bomb')
+_QUIZ = (
+    ("What is 2 + 2?", "4"),
+    ("What is the capital of France?", "Paris"),
+)
+
 # Spin Command (Lucky Wheel)
 def spin(message):
-    rewards = ['₹100', '₹50', 'Emojis', 'Nothing']
-    reward = random.choice(rewards)
+    reward = _rng.choice(_REWARDS)
     bot.send_message(message.chat.id, f"You won: {reward}")
 
 # Mine Command
 def mine(message):
-    outcomes = ['Diamond', 'Bomb']
-    result = random.choice(outcomes)
+    result = _rng.choice(_OUTCOMES)
     if result == 'Diamond':
         bot.send_message(message.chat.id, "You found a Diamond!")
     else:
@@ -18,11 +25,7 @@ def mine(message):
 
 # Quiz Command
 def quiz(message):
-    questions = [
-        ("What is 2 + 2?", "4"),
-        ("What is the capital of France?", "Paris")
-    ]
-    question, answer = random.choice(questions)
+    question, answer = _rng.choice(_QUIZ)
     bot.send_message(message.chat.id, question)
     bot.register_next_step_handler(message, check_answer, answer)
 
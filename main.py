@@ -1,5 +1,8 @@
+import asyncio
+import functools
 import logging
-from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
+import time
+from telegram import Bot, Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -8,8 +11,9 @@ from telegram.ext import (
     MessageHandler,
     filters
 )
-from game_logic import MinesGame
+from game_logic import MinesGame, GRID_SIZE, TILE_COUNT, GEM, BOMB
 from database import UserDatabase
+from edits import throttled_edit
 import config
 import datetime
 from typing import Optional
@@ -27,26 +31,74 @@ db = UserDatabase('users.json')
 # Game states
 user_games: dict[int, MinesGame] = {}
 
-async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Send a message when the command /start is issued."""
-    user = update.effective_user
-    if not db.user_exists(user.id):
-        db.add_user(user.id, user.username or user.first_name, 100)
-        await update.message.reply_text(
-            f"Welcome to Mines Game, {user.first_name}!\n"
-            "You've been given 100 Hiwa to start playing.\n"
-            "Use /help to learn how to play."
-        )
-    else:
-        await update.message.reply_text(
-            f"Welcome back, {user.first_name}!\n"
-            f"Your current balance: {db.get_balance(user.id)} Hiwa\n"
-            "Use /help to see available commands."
-        )
+# Games left idle this long are cleared by the sweeper
+GAME_IDLE_TIMEOUT = 1800
+SWEEP_INTERVAL = 300
 
-async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Send a message when the command /help is issued."""
-    help_text = """
+async def sweep_idle_games(bot: Bot) -> None:
+    """Periodically drop abandoned games so user_games stays bounded."""
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        try:
+            await _sweep_idle_games_once(bot)
+        except Exception as e:
+            logger.error(f"Failed to sweep idle games: {e}")
+
+async def _sweep_idle_games_once(bot: Bot) -> None:
+    """Remove games idle past GAME_IDLE_TIMEOUT and tell their players."""
+    now = time.monotonic()
+    stale = [
+        (user_id, game) for user_id, game in user_games.items()
+        if now - game.last_touch > GAME_IDLE_TIMEOUT
+    ]
+    for user_id, game in stale:
+        # A click may have touched or ended the game while earlier notices were sent
+        if user_games.get(user_id) is not game or game.lock.locked():
+            continue
+        if time.monotonic() - game.last_touch <= GAME_IDLE_TIMEOUT:
+            continue
+        del user_games[user_id]
+        msg = f"⌛ Game expired after {GAME_IDLE_TIMEOUT // 60} minutes of inactivity."
+        if game.gems_revealed >= 2:
+            # Cashing out was already allowed, so pay out like /cashout would
+            winnings = int(game.bet_amount * game.current_multiplier)
+            db.add_balance(user_id, winnings)
+            msg += f"\nAuto cashed out: {winnings} Hiwa"
+        elif not game.revealed_mask:
+            # Refund bets on games where no tile was ever opened
+            db.add_balance(user_id, game.bet_amount)
+            msg += f"\nRefunded: {game.bet_amount} Hiwa"
+        else:
+            msg += f"\nLost: {game.bet_amount} Hiwa"
+        logger.info(f"Removed idle game for user {user_id}")
+        
+        # Replace the board so its buttons stop looking playable
+        if game.message_id is not None:
+            await throttled_edit(
+                bot, game.chat_id, game.message_id,
+                f"{msg}\nNew Balance: {db.get_balance(user_id)} Hiwa"
+            )
+
+class _RateLimiter:
+    """Space out calls so that at most `rate` of them start per second."""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+    
+    async def wait(self) -> None:
+        now = time.monotonic()
+        delay = self._next - now
+        self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+# Telegram allows about 30 messages per second across all chats
+BROADCAST_CONCURRENCY = 28
+BROADCAST_PREFIX = "📢 Admin Broadcast:\n\n"
+_broadcast_limiter = _RateLimiter(30)
+
+HELP_TEXT = """
 🎮 *Mines Game Bot Help* 🎮
 
 *Basic Commands:*
@@ -72,7 +124,33 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 /resetdata - Reset all user data (admin only)
 /setbalance @user <amount> - Set user balance (admin only)
 """
-    await update.message.reply_text(help_text, parse_mode='Markdown')
+
+# Bonus cooldowns in seconds
+DAILY_COOLDOWN = 86400
+WEEKLY_COOLDOWN = 86400 * 7
+
+LEADERBOARD_HEADER = f"{'Rank':<5} {'Player':<15} {'Balance':>10}\n" + "-"*35
+
+async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Send a message when the command /start is issued."""
+    user = update.effective_user
+    if not db.user_exists(user.id):
+        db.add_user(user.id, user.username or user.first_name, 100)
+        await update.message.reply_text(
+            f"Welcome to Mines Game, {user.first_name}!\n"
+            "You've been given 100 Hiwa to start playing.\n"
+            "Use /help to learn how to play."
+        )
+    else:
+        await update.message.reply_text(
+            f"Welcome back, {user.first_name}!\n"
+            f"Your current balance: {db.get_balance(user.id)} Hiwa\n"
+            "Use /help to see available commands."
+        )
+
+async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Send a message when the command /help is issued."""
+    await update.message.reply_text(HELP_TEXT, parse_mode='Markdown')
 
 async def balance(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show user balance."""
@@ -80,45 +158,88 @@ async def balance(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     balance = db.get_balance(user_id)
     await update.message.reply_text(f"Your current balance: {balance} Hiwa")
 
-async def send_game_board(update: Update, user_id: int, game: MinesGame, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Show the interactive game board."""
-    keyboard = []
-    for i in range(5):
-        row = []
-        for j in range(5):
-            tile = game.board[i][j]
-            if tile.revealed:
-                row.append(InlineKeyboardButton(tile.value, callback_data=f"ignore_{i}_{j}"))
-            else:
-                row.append(InlineKeyboardButton("🟦", callback_data=f"reveal_{i}_{j}"))
-        keyboard.append(row)
-    
+_BOARD_TMPL = (
+    "💎 Mines Game 💣\n\n"
+    "Bet: {bet} Hiwa\n"
+    "Mines: {mines}\n"
+    "Gems Found: {gems}/3\n"
+    "Multiplier: {mult:.2f}x\n"
+    "Potential Win: {pot} Hiwa"
+)
+
+# Tile buttons are identical across games, so build each one once
+_UNREVEALED_BTNS = [
+    [InlineKeyboardButton("🟦", callback_data=f"reveal_{i}_{j}") for j in range(GRID_SIZE)]
+    for i in range(GRID_SIZE)
+]
+_REVEALED_BTNS = {
+    face: [
+        [InlineKeyboardButton(face, callback_data=f"ignore_{i}_{j}") for j in range(GRID_SIZE)]
+        for i in range(GRID_SIZE)
+    ]
+    for face in (GEM, BOMB)
+}
+
+def _board_text(game: MinesGame) -> str:
+    """Render the status text shown above the board."""
+    mult = game.current_multiplier
+    return _BOARD_TMPL.format(
+        bet=game.bet_amount, mines=game.mines_count, gems=game.gems_revealed,
+        mult=mult, pot=int(game.bet_amount * mult)
+    )
+
+def _mark_revealed(game: MinesGame, row: int, col: int) -> None:
+    """Flip a single cached tile button to its revealed face."""
+    game.tile_buttons[row][col] = _REVEALED_BTNS[game.tile_value(row * GRID_SIZE + col)][row][col]
+
+def _board_keyboard(game: MinesGame) -> list[list[InlineKeyboardButton]]:
+    """Wrap the cached tile grid with the cash out row when available."""
     if game.gems_revealed >= 2:
-        keyboard.append([
+        return game.tile_buttons + [[
             InlineKeyboardButton(
                 f"💰 Cash Out ({game.current_multiplier:.2f}x)", 
                 callback_data="cashout"
             )
-        ])
-    
-    text = (
-        f"💎 Mines Game 💣\n\n"
-        f"Bet: {game.bet_amount} Hiwa\n"
-        f"Mines: {game.mines_count}\n"
-        f"Gems Found: {game.gems_revealed}/3\n"
-        f"Multiplier: {game.current_multiplier:.2f}x\n"
-        f"Potential Win: {int(game.bet_amount * game.current_multiplier)} Hiwa"
-    )
+        ]]
+    return game.tile_buttons
+
+@functools.lru_cache(maxsize=4096)
+def _final_markup(bomb_mask: int) -> InlineKeyboardMarkup:
+    """Fully revealed board plus the play again button, shared by games with the same bombs."""
+    tiles = [
+        InlineKeyboardButton(BOMB if (bomb_mask >> idx) & 1 else GEM, callback_data="ignore")
+        for idx in range(TILE_COUNT)
+    ]
+    keyboard = [tiles[i:i + GRID_SIZE] for i in range(0, TILE_COUNT, GRID_SIZE)]
+    keyboard.append([InlineKeyboardButton("🎮 Play Again", callback_data="new_game")])
+    return InlineKeyboardMarkup(keyboard)
+
+async def send_game_board(update: Update, user_id: int, game: MinesGame, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Show the interactive game board."""
+    # Rows are copied because _mark_revealed swaps buttons in place
+    game.tile_buttons = [list(row) for row in _UNREVEALED_BTNS]
+    for idx in range(TILE_COUNT):
+        if game.is_revealed(idx):
+            i, j = divmod(idx, GRID_SIZE)
+            game.tile_buttons[i][j] = _REVEALED_BTNS[game.tile_value(idx)][i][j]
+    
+    keyboard = _board_keyboard(game)
+    
+    text = _board_text(game)
     
     try:
-        if hasattr(update, 'callback_query'):
-            await update.callback_query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
+        if update.callback_query:
+            message = update.callback_query.message
+            game.chat_id = message.chat_id
+            game.message_id = message.message_id
+            await throttled_edit(context.bot, message.chat_id, message.message_id, text, InlineKeyboardMarkup(keyboard))
         else:
             msg = await context.bot.send_message(
                 chat_id=user_id,
                 text=text,
                 reply_markup=InlineKeyboardMarkup(keyboard)
             )
+            game.chat_id = msg.chat_id
             game.message_id = msg.message_id
     except Exception as e:
         logger.error(f"Error sending game board: {e}")
@@ -170,34 +291,14 @@ async def start_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
 async def update_game_board(update: Update, game: MinesGame, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Refresh the game board display"""
     query = update.callback_query
-    keyboard = []
-    for i in range(5):
-        row = []
-        for j in range(5):
-            tile = game.board[i][j]
-            text = tile.value if tile.revealed else "🟦"
-            row.append(InlineKeyboardButton(text, callback_data=f"reveal_{i}_{j}"))
-        keyboard.append(row)
+    keyboard = _board_keyboard(game)
     
-    if game.gems_revealed >= 2:
-        keyboard.append([InlineKeyboardButton(
-            f"💰 Cash Out ({game.current_multiplier:.2f}x)", 
-            callback_data="cashout"
-        )])
-    
-    text = (
-        f"💎 Mines Game 💣\n"
-        f"Bet: {game.bet_amount} Hiwa\n"
-        f"Mines: {game.mines_count}\n"
-        f"Gems Found: {game.gems_revealed}/3\n"
-        f"Multiplier: {game.current_multiplier:.2f}x\n"
-        f"Potential Win: {int(game.bet_amount * game.current_multiplier)} Hiwa"
-    )
+    text = _board_text(game)
     
-    try:
-        await query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
-    except Exception as e:
-        logger.error(f"Error updating game board: {e}")
+    await throttled_edit(
+        context.bot, query.message.chat_id, query.message.message_id,
+        text, InlineKeyboardMarkup(keyboard)
+    )
 
 async def handle_game_over(update: Update, user_id: int, game: MinesGame, won: bool, context: ContextTypes.DEFAULT_TYPE):
     """Handle game conclusion"""
@@ -205,66 +306,100 @@ async def handle_game_over(update: Update, user_id: int, game: MinesGame, won: b
     if user_id in user_games:
         del user_games[user_id]
     
-    # Show final board
-    keyboard = []
-    for row in game.board:
-        keyboard_row = []
-        for tile in row:
-            keyboard_row.append(InlineKeyboardButton(tile.value, callback_data="ignore"))
-        keyboard.append(keyboard_row)
-    
     if won:
         msg = f"🎉 Cashout Successful!\nWon: {int(game.bet_amount * game.current_multiplier)} Hiwa"
     else:
         msg = f"💥 Game Over!\nLost: {game.bet_amount} Hiwa"
     
-    keyboard.append([InlineKeyboardButton("🎮 Play Again", callback_data="new_game")])
-    
-    try:
-        await update.callback_query.edit_message_text(
-            f"{msg}\nNew Balance: {db.get_balance(user_id)} Hiwa",
-            reply_markup=InlineKeyboardMarkup(keyboard)
-        )
-    except Exception as e:
-        logger.error(f"Error handling game over: {e}")
+    # /cashout may come from another chat, so edit the board where it was sent
+    await throttled_edit(
+        context.bot, game.chat_id, game.message_id,
+        f"{msg}\nNew Balance: {db.get_balance(user_id)} Hiwa",
+        _final_markup(game.bomb_mask)
+    )
 
-async def button_click(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle all button interactions"""
+async def _active_game(update: Update) -> Optional[MinesGame]:
+    """Return the game behind the clicked board, answering the callback if there is none"""
+    query = update.callback_query
+    game = user_games.get(query.from_user.id)
+    if game is None:
+        # Answer instead of editing so a queued game-over edit is not replaced
+        await query.answer("🚫 No active game! Use /mine to start")
+    elif query.message.message_id != game.message_id:
+        # Tile callbacks carry no game id, so clicks on an old board must not reach the new game
+        await query.answer("🚫 This board is finished. Use your latest game.")
+        return None
+    return game
+
+async def _finish_cashout(update: Update, context: ContextTypes.DEFAULT_TYPE, game: MinesGame) -> None:
+    """Pay out a game after the callback has been answered"""
     query = update.callback_query
-    await query.answer()
-    
     user_id = query.from_user.id
     
-    # Check if user has an active game
-    if user_id not in user_games:
-        await query.edit_message_text("🚫 No active game! Use /mine to start")
-        return
-    
-    game = user_games[user_id]
-    
-    # Handle cashout button
-    if query.data == "cashout":
-        if game.gems_revealed >= 2:
-            win_amount = int(game.bet_amount * game.current_multiplier)
-            db.add_balance(user_id, win_amount)
-            await handle_game_over(update, user_id, game, won=True, context=context)
-        else:
-            await query.answer("❌ You need at least 2 gems to cash out!", show_alert=True)
+    async with game.lock:
+        # The game may have ended while this click waited for the lock
+        if user_games.get(user_id) is not game:
+            return
+        
+        # on_cashout checked for 2 gems, and reveals never lower the count
+        win_amount = int(game.bet_amount * game.current_multiplier)
+        db.add_balance(user_id, win_amount)
+        await handle_game_over(update, user_id, game, won=True, context=context)
+
+async def _finish_reveal(update: Update, context: ContextTypes.DEFAULT_TYPE, game: MinesGame, row: int, col: int) -> None:
+    """Open a tile after the callback has been answered"""
+    user_id = update.callback_query.from_user.id
     
-    # Handle tile reveals
-    elif query.data.startswith("reveal_"):
-        _, row, col = query.data.split("_")
-        row = int(row)
-        col = int(col)
+    async with game.lock:
+        # The game may have ended while this click waited for the lock
+        if user_games.get(user_id) is not game:
+            return
+        
+        # Repeated clicks on an opened tile change nothing
+        if game.is_revealed(row * GRID_SIZE + col):
+            return
         
         if game.reveal_tile(row, col):
+            _mark_revealed(game, row, col)
             await update_game_board(update, game, context)
         else:
             await handle_game_over(update, user_id, game, won=False, context=context)
-    
-    # Handle new game button
-    elif query.data == "new_game":
-        await query.edit_message_text("Use /mine <amount> <mines> to start a new game!")
+
+async def on_cashout(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle the cash out button"""
+    game = await _active_game(update)
+    if game:
+        # The callback can only be answered once, so decide on the alert here
+        if game.gems_revealed < 2:
+            await update.callback_query.answer("❌ You need at least 2 gems to cash out!", show_alert=True)
+            return
+        await update.callback_query.answer()
+        # Finish in the background so the callback returns at once
+        context.application.create_task(_finish_cashout(update, context, game), update=update)
+
+async def on_reveal(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle a tile button"""
+    game = await _active_game(update)
+    if game:
+        await update.callback_query.answer()
+        # The handler pattern guarantees reveal_<row>_<col> with single digits
+        data = update.callback_query.data
+        row = int(data[7])
+        col = int(data[9])
+        context.application.create_task(_finish_reveal(update, context, game, row, col), update=update)
+
+async def on_new_game(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle the play again button"""
+    query = update.callback_query
+    await query.answer()
+    await throttled_edit(
+        context.bot, query.message.chat_id, query.message.message_id,
+        "Use /mine <amount> <mines> to start a new game!"
+    )
+
+async def on_ignore(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Acknowledge clicks on opened or final-board tiles"""
+    await update.callback_query.answer()
 
 async def cashout_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /cashout command"""
@@ -274,41 +409,45 @@ async def cashout_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         return
     
     game = user_games[user_id]
-    if game.gems_revealed >= 2:
-        winnings = int(game.bet_amount * game.current_multiplier)
-        db.add_balance(user_id, winnings)
-        await handle_game_over(update, user_id, game, won=True, context=context)
-    else:
-        await update.message.reply_text("You need at least 2 gems to cash out!")
+    async with game.lock:
+        if user_games.get(user_id) is not game:
+            await update.message.reply_text("No active game! Start with /mine")
+            return
+        
+        if game.gems_revealed >= 2:
+            winnings = int(game.bet_amount * game.current_multiplier)
+            db.add_balance(user_id, winnings)
+            await handle_game_over(update, user_id, game, won=True, context=context)
+        else:
+            await update.message.reply_text("You need at least 2 gems to cash out!")
 
 async def daily_bonus(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle daily bonus with proper cooldown message"""
     user_id = update.effective_user.id
     
     try:
-        last_claim = db.get_last_daily(user_id)
-        now = datetime.datetime.now()
+        last_ts = db.get_last_daily(user_id)
+        now_ts = int(time.time())
         
-        if last_claim:
-            next_available = last_claim + datetime.timedelta(hours=24)
-            if now < next_available:
-                remaining = next_available - now
-                hours, remainder = divmod(remaining.seconds, 3600)
-                minutes, _ = divmod(remainder, 60)
-                
-                await update.message.reply_text(
-                    f"⏳ *Daily Bonus Already Claimed!*\n\n"
-                    f"You've already collected your daily bonus.\n"
-                    f"Next available in: *{hours}h {minutes}m*\n"
-                    f"Reset time: {next_available.strftime('%Y-%m-%d %H:%M:%S')}",
-                    parse_mode='Markdown'
-                )
-                return
+        if last_ts and now_ts - last_ts < DAILY_COOLDOWN:
+            remaining = DAILY_COOLDOWN - (now_ts - last_ts)
+            hours, remainder = divmod(remaining, 3600)
+            minutes = remainder // 60
+            next_available = datetime.datetime.fromtimestamp(last_ts + DAILY_COOLDOWN)
+            
+            await update.message.reply_text(
+                f"⏳ *Daily Bonus Already Claimed!*\n\n"
+                f"You've already collected your daily bonus.\n"
+                f"Next available in: *{hours}h {minutes}m*\n"
+                f"Reset time: {next_available.strftime('%Y-%m-%d %H:%M:%S')}",
+                parse_mode='Markdown'
+            )
+            return
         
         # Grant bonus if not claimed or cooldown passed
         amount = 50
         db.add_balance(user_id, amount)
-        db.set_last_daily(user_id, now)
+        db.set_last_daily(user_id, now_ts)
         
         await update.message.reply_text(
             f"🎁 *Daily Bonus Collected!*\n\n"
@@ -327,30 +466,29 @@ async def weekly_bonus(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     user_id = update.effective_user.id
     
     try:
-        last_claim = db.get_last_weekly(user_id)
-        now = datetime.datetime.now()
+        last_ts = db.get_last_weekly(user_id)
+        now_ts = int(time.time())
         
-        if last_claim:
-            next_available = last_claim + datetime.timedelta(days=7)
-            if now < next_available:
-                remaining = next_available - now
-                days = remaining.days
-                hours, remainder = divmod(remaining.seconds, 3600)
-                minutes, _ = divmod(remainder, 60)
-                
-                await update.message.reply_text(
-                    f"⏳ *Weekly Bonus Already Claimed!*\n\n"
-                    f"You've already collected your weekly bonus.\n"
-                    f"Next available in: *{days}d {hours}h {minutes}m*\n"
-                    f"Reset time: {next_available.strftime('%Y-%m-%d %H:%M:%S')}",
-                    parse_mode='Markdown'
-                )
-                return
+        if last_ts and now_ts - last_ts < WEEKLY_COOLDOWN:
+            remaining = WEEKLY_COOLDOWN - (now_ts - last_ts)
+            days, remainder = divmod(remaining, 86400)
+            hours, remainder = divmod(remainder, 3600)
+            minutes = remainder // 60
+            next_available = datetime.datetime.fromtimestamp(last_ts + WEEKLY_COOLDOWN)
+            
+            await update.message.reply_text(
+                f"⏳ *Weekly Bonus Already Claimed!*\n\n"
+                f"You've already collected your weekly bonus.\n"
+                f"Next available in: *{days}d {hours}h {minutes}m*\n"
+                f"Reset time: {next_available.strftime('%Y-%m-%d %H:%M:%S')}",
+                parse_mode='Markdown'
+            )
+            return
         
         # Grant bonus if not claimed or cooldown passed
         amount = 200
         db.add_balance(user_id, amount)
-        db.set_last_weekly(user_id, now)
+        db.set_last_weekly(user_id, now_ts)
         
         await update.message.reply_text(
             f"🎁 *Weekly Bonus Collected!*\n\n"
@@ -374,13 +512,9 @@ async def leaderboard(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             await update.message.reply_text("🏆 Leaderboard is empty! Be the first to play!")
             return
 
-        message = ["🏆 <b>TOP PLAYERS</b> 🏆", "", "<pre>"]
-        headers = ["Rank", "Player", "Balance"]
-        message.append(f"{headers[0]:<5} {headers[1]:<15} {headers[2]:>10}")
-        message.append("-"*35)
+        message = ["🏆 <b>TOP PLAYERS</b> 🏆", "", "<pre>", LEADERBOARD_HEADER]
         
-        for rank, (user_id, username, balance) in enumerate(top_users, 1):
-            display_name = username if username else f"User{str(user_id)[:4]}"
+        for rank, (user_id, display_name, balance) in enumerate(top_users, 1):
             message.append(f"{rank:<5} {display_name[:15]:<15} {balance:>10} Hiwa")
         
         message.extend(["</pre>", "", "Play /mine to climb ranks!"])
@@ -454,16 +588,23 @@ async def admin_broadcast(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await update.message.reply_text("Usage: /broadcast <message>")
         return
     
-    message = " ".join(context.args)
+    # Every recipient gets the same text, so build it once
+    text = BROADCAST_PREFIX + " ".join(context.args)
     users = db.get_all_users()
-    success = 0
+    sem = asyncio.Semaphore(BROADCAST_CONCURRENCY)
     
-    for user_id in users:
-        try:
-            await context.bot.send_message(chat_id=user_id, text=f"📢 Admin Broadcast:\n\n{message}")
-            success += 1
-        except Exception as e:
-            logger.error(f"Failed to send broadcast to {user_id}: {e}")
+    async def _one(uid: int) -> bool:
+        async with sem:
+            await _broadcast_limiter.wait()
+            try:
+                await context.bot.send_message(chat_id=uid, text=text)
+                return True
+            except Exception as e:
+                logger.error(f"Failed to send broadcast to {uid}: {e}")
+                return False
+    
+    results = await asyncio.gather(*[_one(uid) for uid in users])
+    success = sum(results)
     
     await update.message.reply_text(f"Broadcast sent to {success}/{len(users)} users.")
 
@@ -508,9 +649,33 @@ async def admin_set_balance(update: Update, context: ContextTypes.DEFAULT_TYPE)
     db.set_balance(target_id, amount)
     await update.message.reply_text(f"Set @{username}'s balance to {amount} Hiwa.")
 
+async def post_init(application: Application) -> None:
+    """Start background tasks once the event loop is running."""
+    application.bot_data["flush_task"] = asyncio.create_task(db.flush_loop())
+    application.bot_data["sweep_task"] = asyncio.create_task(sweep_idle_games(application.bot))
+
+async def post_shutdown(application: Application) -> None:
+    """Stop background tasks, then persist pending user data before exiting."""
+    for name in ("flush_task", "sweep_task"):
+        task = application.bot_data.pop(name, None)
+        if task is None:
+            continue
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    db.flush()
+
 def main() -> None:
     """Start the bot."""
-    application = Application.builder().token(config.TOKEN).build()
+    application = (
+        Application.builder()
+        .token(config.TOKEN)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
     
     # Command handlers
     application.add_handler(CommandHandler("start", start))
@@ -528,8 +693,11 @@ def main() -> None:
     application.add_handler(CommandHandler("resetdata", admin_reset_data))
     application.add_handler(CommandHandler("setbalance", admin_set_balance))
     
-    # Button click handler
-    application.add_handler(CallbackQueryHandler(button_click))
+    # Button click handlers
+    application.add_handler(CallbackQueryHandler(on_cashout, pattern=r"^cashout$"))
+    application.add_handler(CallbackQueryHandler(on_reveal, pattern=r"^reveal_[0-4]_[0-4]$"))
+    application.add_handler(CallbackQueryHandler(on_new_game, pattern=r"^new_game$"))
+    application.add_handler(CallbackQueryHandler(on_ignore, pattern=r"^ignore"))
     
     # Run the bot
     application.run_polling()
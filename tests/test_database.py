@@ -0,0 +1,92 @@
+import datetime
+import json
+
+import pytest
+
+import database
+from database import UserDatabase
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "users.json"
+
+
+def test_load_converts_iso_claim_times_to_epoch(path):
+    path.write_text(json.dumps({
+        "5": {"username": "Bob", "balance": 10, "last_daily": "2026-10-15T10:00:00", "last_weekly": None},
+    }))
+    db = UserDatabase(str(path))
+    expected = int(datetime.datetime(2026, 10, 15, 10, 0, 0).timestamp())
+    assert db.get_last_daily(5) == expected
+    assert db.get_last_weekly(5) is None
+
+
+def test_load_fills_missing_fields(path):
+    path.write_text(json.dumps({"5": {"username": "Bob"}}))
+    db = UserDatabase(str(path))
+    assert db.get_balance(5) == 0
+    db.add_balance(5, 3)
+    assert db.get_balance(5) == 3
+    assert db.get_user_id_by_username("bob") == 5
+
+
+def test_load_refuses_unreadable_file(path):
+    path.write_text('{"5": {"username": "Bob", "bal')
+    with pytest.raises(ValueError):
+        UserDatabase(str(path))
+    assert path.read_text() == '{"5": {"username": "Bob", "bal'
+
+
+def _count_replaces(monkeypatch):
+    calls = []
+    real_replace = database.os.replace
+
+    def counting_replace(src, dst):
+        calls.append(dst)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(database.os, "replace", counting_replace)
+    return calls
+
+
+def test_flush_skips_when_nothing_changed(path, monkeypatch):
+    calls = _count_replaces(monkeypatch)
+    db = UserDatabase(str(path))
+    db.flush()
+    assert calls == []
+    assert not path.exists()
+
+    db.add_user(1, "alice", 100)
+    db.flush()
+    db.flush()
+    assert len(calls) == 1
+    assert json.loads(path.read_text())["1"]["balance"] == 100
+
+
+def test_flush_writes_again_after_a_change(path, monkeypatch):
+    calls = _count_replaces(monkeypatch)
+    db = UserDatabase(str(path))
+    db.add_user(1, "alice", 100)
+    db.flush()
+    db.add_balance(1, 5)
+    db.flush()
+    assert len(calls) == 2
+    assert json.loads(path.read_text())["1"]["balance"] == 105
+
+
+def test_failed_flush_is_retried_and_cleans_up(path, monkeypatch):
+    db = UserDatabase(str(path))
+    db.add_user(1, "alice", 100)
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(database.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        db.flush()
+    assert list(path.parent.iterdir()) == []
+
+    monkeypatch.undo()
+    db.flush()
+    assert json.loads(path.read_text())["1"]["balance"] == 100
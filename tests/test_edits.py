@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import RetryAfter
+
+import edits
+from edits import throttled_edit
+
+INTERVAL = 0.05
+
+
+class StubBot:
+    """Records edits and raises RetryAfter for the first `rate_limited` calls."""
+
+    def __init__(self, rate_limited: int = 0):
+        self.calls = []
+        self.rate_limited = rate_limited
+
+    async def _edit(self, kind, chat_id, message_id, text=None):
+        if self.rate_limited:
+            self.rate_limited -= 1
+            raise RetryAfter(5)
+        self.calls.append((kind, message_id, text))
+
+    async def edit_message_text(self, text, chat_id, message_id, reply_markup=None):
+        await self._edit("text", chat_id, message_id, text)
+
+    async def edit_message_reply_markup(self, chat_id, message_id, reply_markup=None):
+        await self._edit("markup", chat_id, message_id)
+
+
+@pytest.fixture(autouse=True)
+def fast_pacing(monkeypatch):
+    monkeypatch.setattr(edits, "EDIT_INTERVAL", INTERVAL)
+    monkeypatch.setattr(edits, "MAX_RETRY_AFTER", INTERVAL * 2)
+    monkeypatch.setattr(edits, "EDIT_STATE_TTL", INTERVAL * 10)
+    monkeypatch.setattr(edits, "_edit_state", {})
+
+
+def _markup(label):
+    return InlineKeyboardMarkup([[InlineKeyboardButton(label, callback_data="x")]])
+
+
+def test_first_edit_is_sent_immediately():
+    async def scenario():
+        bot = StubBot()
+        await throttled_edit(bot, 1, 10, "a")
+        return bot.calls
+
+    assert asyncio.run(scenario()) == [("text", 10, "a")]
+
+
+def test_burst_is_coalesced_into_one_trailing_edit():
+    async def scenario():
+        bot = StubBot()
+        await throttled_edit(bot, 1, 10, "a")
+        await throttled_edit(bot, 1, 10, "b")
+        await throttled_edit(bot, 1, 10, "c")
+        assert bot.calls == [("text", 10, "a")]
+        await asyncio.sleep(INTERVAL * 3)
+        return bot.calls
+
+    assert asyncio.run(scenario()) == [("text", 10, "a"), ("text", 10, "c")]
+
+
+def test_unchanged_edit_is_skipped_and_markup_only_change_uses_markup_edit():
+    async def scenario():
+        bot = StubBot()
+        await throttled_edit(bot, 1, 10, "a", _markup("1"))
+        await asyncio.sleep(INTERVAL * 2)
+        await throttled_edit(bot, 1, 10, "a", _markup("1"))
+        await asyncio.sleep(INTERVAL * 2)
+        await throttled_edit(bot, 1, 10, "a", _markup("2"))
+        return bot.calls
+
+    assert asyncio.run(scenario()) == [("text", 10, "a"), ("markup", 10, None)]
+
+
+def test_retry_after_resends_the_edit_after_backoff():
+    async def scenario():
+        bot = StubBot(rate_limited=1)
+        await throttled_edit(bot, 1, 10, "game over")
+        assert bot.calls == []
+        await asyncio.sleep(INTERVAL * 4)
+        return bot.calls
+
+    assert asyncio.run(scenario()) == [("text", 10, "game over")]
+
+
+def test_edit_to_another_message_does_not_replace_a_queued_one():
+    async def scenario():
+        bot = StubBot(rate_limited=1)
+        await throttled_edit(bot, 1, 10, "game over on A")
+        await throttled_edit(bot, 1, 11, "board B reveal")
+        await asyncio.sleep(INTERVAL * 6)
+        return bot.calls
+
+    assert asyncio.run(scenario()) == [
+        ("text", 10, "game over on A"),
+        ("text", 11, "board B reveal"),
+    ]
+
+
+def test_idle_chat_state_is_evicted():
+    async def scenario():
+        bot = StubBot()
+        await throttled_edit(bot, 1, 10, "a")
+        assert 1 in edits._edit_state
+        await asyncio.sleep(INTERVAL * 12)
+        return edits._edit_state
+
+    assert asyncio.run(scenario()) == {}
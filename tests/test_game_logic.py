@@ -0,0 +1,68 @@
+import pytest
+
+import game_logic
+from game_logic import MinesGame, GRID_SIZE, TILE_COUNT, HOUSE_EDGE
+
+
+@pytest.fixture
+def game():
+    game_logic._rng.seed(1234)
+    return MinesGame(10, 3)
+
+
+def _safe_tiles(game):
+    return [idx for idx in range(TILE_COUNT) if not game.is_bomb(idx)]
+
+
+def _bomb_tiles(game):
+    return [idx for idx in range(TILE_COUNT) if game.is_bomb(idx)]
+
+
+def test_bomb_mask_has_mines_count_bits(game):
+    assert game.bomb_mask.bit_count() == 3
+    assert game.bomb_mask < 1 << TILE_COUNT
+
+
+def test_seeded_rng_repeats_layout():
+    game_logic._rng.seed(7)
+    first = MinesGame(1, 5).bomb_mask
+    game_logic._rng.seed(7)
+    assert MinesGame(1, 5).bomb_mask == first
+
+
+def test_reveal_gem_sets_bit_and_counts(game):
+    idx = _safe_tiles(game)[0]
+    assert game.reveal_tile(*divmod(idx, GRID_SIZE)) is True
+    assert game.revealed_mask == 1 << idx
+    assert game.is_revealed(idx)
+    assert game.gems_revealed == 1
+
+
+def test_reveal_same_tile_twice_counts_once(game):
+    idx = _safe_tiles(game)[0]
+    game.reveal_tile(*divmod(idx, GRID_SIZE))
+    game.reveal_tile(*divmod(idx, GRID_SIZE))
+    assert game.gems_revealed == 1
+
+
+def test_reveal_bomb_returns_false_and_is_not_a_gem(game):
+    idx = _bomb_tiles(game)[0]
+    assert game.reveal_tile(*divmod(idx, GRID_SIZE)) is False
+    assert game.is_revealed(idx)
+    assert game.gems_revealed == 0
+
+
+def test_multiplier_without_gems_is_one(game):
+    assert game.current_multiplier == 1.0
+
+
+@pytest.mark.parametrize("gems, expected", [
+    (1, HOUSE_EDGE * 25 / 22),
+    (2, HOUSE_EDGE * 25 / 22 * 24 / 21),
+    (3, HOUSE_EDGE * 25 / 22 * 24 / 21 * 23 / 20),
+])
+def test_multiplier_follows_fair_odds(game, gems, expected):
+    for idx in _safe_tiles(game)[:gems]:
+        game.reveal_tile(*divmod(idx, GRID_SIZE))
+    assert game.current_multiplier == pytest.approx(expected)
+